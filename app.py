@@ -3,9 +3,33 @@ import pandas as pd
 from datetime import datetime
 import io
 import re
+import time
+import random
 import requests
 import base64
-from typing import Tuple, Optional, List, Dict
+import threading
+import uuid
+import os
+import json
+import csv
+import logging
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Tuple, Optional, List, Dict, Sequence
+
+try:
+    # Multithreaded CSV engine and on-disk dataset snapshots, optional
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as arrow_csv, feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # CONFIGURATION
@@ -25,7 +49,46 @@ GITHUB_OWNER = "mohammed-seid"
 GITHUB_REPO = "hfc-data-private"
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "admin123"
-CACHE_TTL = 3600  # 1 hour
+DATASET_VERSION_TTL = 60  # seconds between checks for new constraints/logic files
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_TIMEOUT = 10  # seconds, applied to every GitHub call
+GITHUB_POOL_SIZE = 16
+GITHUB_MAX_RETRIES = 3
+GITHUB_BACKOFF_BASE = 0.5  # seconds
+GITHUB_BACKOFF_MAX = 8  # seconds
+GITHUB_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+GITHUB_CONFLICT_STATUS_CODES = {409, 422}
+GITHUB_RAW_MEDIA_TYPE = "application/vnd.github.raw"
+TOKEN_CHECK_TTL = 300  # seconds a successful GitHub call vouches for the token
+CORRECTIONS_CACHE_TTL = 30  # seconds, corrections are also cleared on save
+DATASET_FILES = ("constraints.csv", "logic.csv")
+# Declared schema for the dataset files: repetitive text columns are categorical,
+# value columns keep read_csv's numeric inference (non-numeric cells must survive
+# for outlier detection) and any column not listed here or id-like is dropped
+DATASET_CATEGORY_COLUMNS = ('username', 'supervisor', 'woreda', 'kebele', 'variable', 'constraint', 'subdate')
+DATASET_COLUMNS = DATASET_CATEGORY_COLUMNS + ('farmer_name', 'phone_no', 'value', 'Troster Value')
+GITHUB_BRANCH = "main"
+CORRECTIONS_FILE = "corrections.csv"  # compacted base file
+CORRECTIONS_SHARD_DIR = "corrections"  # append-only shards, one per save batch
+CORRECTIONS_COMPACT_THRESHOLD = 200  # shards before a save triggers compaction
+CORRECTIONS_SAVE_ATTEMPTS = 4
+SAVE_FLUSH_INTERVAL = 2  # seconds a batch may wait to be coalesced with others
+SAVE_FLUSH_MAX_ROWS = 500  # flush early once this many rows are queued
+SAVE_CONFIRM_TIMEOUT = 60  # seconds a caller waits for its rows to be committed
+SAVE_REPLAY_ATTEMPTS = 5  # failed flushes before a replayed batch is logged and dropped
+LOCAL_CACHE_DIR = ".hfc_cache"
+LOCAL_SNAPSHOT_DIR = os.path.join(LOCAL_CACHE_DIR, "snapshots")  # parsed datasets, one Feather file per blob sha
+LOCAL_SNAPSHOT_MAX_BYTES = 512 * 1024 * 1024  # least recently used snapshots are evicted past this
+LOCAL_SNAPSHOT_FORMAT = 2  # bump when the parsed dataset schema changes
+MAX_FETCH_WORKERS = 8
+CSV_ENGINE = "pyarrow"  # "pyarrow" when installed, otherwise pandas' "c" parser
+CSV_ARROW_STRINGS = False  # store text columns as Arrow-backed strings
+CSV_TEXT_COLUMNS = ('subdate', 'correction_date', 'correction_timestamp')  # date-like text kept as written
+CSV_NULL_VALUES = ('', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                   '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null')  # pandas' default NA strings
+CSV_INT64_PATTERN = r"^-?\d{1,18}$"  # integer text that always fits in int64
+CSV_BOOL_VALUES = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+FARMERS_PER_PAGE = 10  # correction forms instantiated per rerun
 
 # ============================================================================
 # STYLING - Mobile-First Design
@@ -112,6 +175,10 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Partial reruns where available (st.fragment, or its experimental name before
+# 1.37); on older Streamlit the decorated block simply reruns with the app
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
@@ -121,10 +188,15 @@ def initialize_session_state():
     defaults = {
         'corrected_errors': set(),
         'all_corrections_data': {},
+        'corrections_by_farmer': {},
+        'correction_issues': {},
+        'completed_by_farmer': {},
         'is_admin': False,
         'selected_enumerator': None,
         'show_completed': False,
-        'filter_error_type': 'All'
+        'filter_error_type': 'All',
+        'farmer_page': 0,
+        'farmer_page_context': None
     }
     
     for key, value in defaults.items():
@@ -133,6 +205,90 @@ def initialize_session_state():
 
 initialize_session_state()
 
+@dataclass
+class CorrectionDraft:
+    """A pending correction with the fields of its error row that are saved alongside it"""
+    __slots__ = ('error_type', 'farmer_id', 'variable', 'correct_value', 'explanation',
+                 'outside_range', 'differs_from_both', 'username', 'supervisor', 'woreda', 'kebele',
+                 'farmer_name', 'phone_no', 'subdate', 'original_value', 'reference_value')
+    
+    error_type: str
+    farmer_id: object
+    variable: str
+    correct_value: int
+    explanation: str
+    outside_range: bool
+    differs_from_both: bool
+    username: object
+    supervisor: object
+    woreda: object
+    kebele: object
+    farmer_name: object
+    phone_no: object
+    subdate: object
+    original_value: object
+    reference_value: object
+
+def get_draft_fields(error: pd.Series, reference_column: str) -> Dict:
+    """Pick the fields of an error row that are saved with its correction"""
+    return {
+        'username': error.get('username', ''),
+        'supervisor': error.get('supervisor', ''),
+        'woreda': error.get('woreda', ''),
+        'kebele': error.get('kebele', ''),
+        'farmer_name': error.get('farmer_name', ''),
+        'phone_no': error.get('phone_no', ''),
+        'subdate': error.get('subdate', ''),
+        'original_value': error.get('value', ''),
+        'reference_value': error.get(reference_column, '')
+    }
+
+def update_draft_status(error_key: str, draft: CorrectionDraft, sign: int):
+    """Add (sign=1) or remove (sign=-1) a draft's share of the validation counters"""
+    issue = get_draft_issue(draft)
+    
+    if issue is None:
+        farmer_id = str(draft.farmer_id)
+        completed_by_farmer = st.session_state.completed_by_farmer
+        completed_by_farmer[farmer_id] = completed_by_farmer.get(farmer_id, 0) + sign
+        if not completed_by_farmer[farmer_id]:
+            del completed_by_farmer[farmer_id]
+    elif sign > 0:
+        st.session_state.correction_issues[error_key] = issue
+    else:
+        st.session_state.correction_issues.pop(error_key, None)
+
+def store_correction_draft(error_key: str, draft: CorrectionDraft):
+    """Store a pending correction, indexed by error key and by farmer"""
+    previous = st.session_state.all_corrections_data.get(error_key)
+    # Compared field by field: each full rerun redefines the class, and
+    # dataclass equality does not hold across two definitions
+    if previous is not None and astuple(previous) == astuple(draft):
+        return
+    if previous is not None:
+        update_draft_status(error_key, previous, -1)
+    
+    st.session_state.all_corrections_data[error_key] = draft
+    st.session_state.corrections_by_farmer.setdefault(str(draft.farmer_id), {})[error_key] = draft
+    update_draft_status(error_key, draft, 1)
+
+def remove_correction_draft(error_key: str):
+    """Drop a pending correction from both indexes"""
+    draft = st.session_state.all_corrections_data.pop(error_key, None)
+    if draft is None:
+        return
+    update_draft_status(error_key, draft, -1)
+    
+    farmer_id = str(draft.farmer_id)
+    farmer_corrections = st.session_state.corrections_by_farmer.get(farmer_id, {})
+    farmer_corrections.pop(error_key, None)
+    if not farmer_corrections:
+        st.session_state.corrections_by_farmer.pop(farmer_id, None)
+
+def get_farmer_corrections(farmer_id) -> Dict[str, CorrectionDraft]:
+    """Get the pending corrections of one farmer without scanning the others"""
+    return st.session_state.corrections_by_farmer.get(str(farmer_id), {})
+
 # ============================================================================
 # GITHUB API FUNCTIONS
 # ============================================================================
@@ -148,104 +304,852 @@ def get_github_headers() -> Dict[str, str]:
         "Accept": "application/vnd.github.v3+json"
     }
 
-def fetch_file_from_github(filename: str) -> Optional[pd.DataFrame]:
-    """Fetch and parse CSV file from GitHub"""
-    try:
-        headers = get_github_headers()
-        url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{filename}"
+def get_contents_url(path: str) -> str:
+    """Build the GitHub contents API URL for a file in the data repository"""
+    return f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{path}"
+
+def get_git_url(path: str) -> str:
+    """Build the GitHub Git database API URL for the data repository"""
+    return f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/git/{path}"
+
+@st.cache_resource
+def get_github_session() -> requests.Session:
+    """Create the process-wide pooled HTTP session shared by all GitHub calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=GITHUB_POOL_SIZE)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_token_status() -> Dict[str, float]:
+    """Process-wide record of until when the token is known to be valid"""
+    return {'valid_until': 0.0}
+
+def record_token_status(status_code: int):
+    """Treat a successful call as proof the token is valid, and a 401 as proof it is not"""
+    token_status = get_token_status()
+    if status_code == 401:
+        token_status['valid_until'] = 0.0
+    elif status_code < 300 or status_code == 304:
+        token_status['valid_until'] = time.monotonic() + TOKEN_CHECK_TTL
+
+def get_backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with full jitter, honouring Retry-After within the cap"""
+    delay = random.uniform(0, min(GITHUB_BACKOFF_MAX, GITHUB_BACKOFF_BASE * (2 ** attempt)))
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return min(delay, GITHUB_BACKOFF_MAX)
+
+def github_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send an authenticated GitHub request, retrying 5xx/429 and connection errors"""
+    headers = get_github_headers()
+    headers.update(kwargs.pop("headers", None) or {})
+    kwargs.setdefault("timeout", GITHUB_TIMEOUT)
+    session = get_github_session()
+    
+    for attempt in range(GITHUB_MAX_RETRIES + 1):
+        try:
+            response = session.request(method, url, headers=headers, **kwargs)
+        except requests.exceptions.ConnectionError:
+            # Covers connect timeouts too; read timeouts are not retried because
+            # the request may already have been applied
+            if attempt == GITHUB_MAX_RETRIES:
+                raise
+            time.sleep(get_backoff_delay(attempt))
+            continue
         
-        response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code not in GITHUB_RETRY_STATUS_CODES or attempt == GITHUB_MAX_RETRIES:
+            record_token_status(response.status_code)
+            return response
         
-        if response.status_code != 200:
-            st.error(f"Failed to load {filename}: {response.status_code}")
+        response.close()
+        time.sleep(get_backoff_delay(attempt, response.headers.get("Retry-After")))
+
+def get_csv_read_options(path: str) -> Dict:
+    """Parser options for a repository file: the declared schema for dataset files"""
+    if path not in DATASET_FILES:
+        return {}
+    
+    return {
+        # id-like columns are kept for get_unique_id_column
+        'usecols': lambda column: column in DATASET_COLUMNS or is_id_column(column),
+        'dtype': {column: 'category' for column in DATASET_CATEGORY_COLUMNS}
+    }
+
+@st.cache_resource
+def get_arrow_csv_fallbacks() -> set:
+    """Kinds of file the Arrow engine could not parse as the C parser would; these use the C parser"""
+    return set()
+
+def is_id_column(column: str) -> bool:
+    """Whether a column holds identifiers, by the rule get_unique_id_column falls back to"""
+    return 'id' in column.lower()
+
+def read_arrow_csv(source, read_options: Dict) -> Optional[pd.DataFrame]:
+    """Parse a binary CSV stream with Arrow, keeping declared text columns as written
+    
+    Declared text columns stay text and id-like columns are read as text and
+    converted to numbers or booleans as pandas would, so large or hexadecimal
+    IDs are not altered. Other columns use Arrow's inference, which agrees with the C
+    parser on plain numbers and booleans; None is returned when it infers a
+    date or time the C parser would keep as text.
+    """
+    # The header is read here so the wanted columns are known before parsing
+    names = next(csv.reader([source.readline().decode('utf-8-sig')]), [])
+    if not names or len(set(names)) != len(names):
+        return None
+    
+    usecols = read_options.get('usecols') or (lambda column: True)
+    text_columns = set(read_options.get('dtype') or {}) | set(CSV_TEXT_COLUMNS)
+    
+    table = arrow_csv.read_csv(
+        source,
+        read_options=arrow_csv.ReadOptions(column_names=names),
+        convert_options=arrow_csv.ConvertOptions(
+            include_columns=[column for column in names if usecols(column)],
+            column_types={column: pa.string() for column in names if column in text_columns or is_id_column(column)},
+            null_values=list(CSV_NULL_VALUES),
+            strings_can_be_null=True
+        )
+    )
+    
+    if table.num_rows == 0 or any(pa.types.is_temporal(field.type) for field in table.schema):
+        return None
+    
+    converted_id_columns = []
+    for index, field in enumerate(table.schema):
+        values = table.column(index)
+        if values.null_count == table.num_rows:
+            # Empty columns come back untyped; the C parser reads them as float NaN
+            table = table.set_column(index, field.name, values.cast(pa.float64()))
+        elif is_id_column(field.name) and field.name not in text_columns:
+            # Plain integer IDs are cast in Arrow; anything else (20 digits, hex,
+            # padding) is left to pandas
+            if pc.all(pc.match_substring_regex(values, CSV_INT64_PATTERN)).as_py():
+                table = table.set_column(index, field.name, values.cast(pa.int64()))
+            else:
+                converted_id_columns.append(field.name)
+    
+    df = table.to_pandas()
+    for column in converted_id_columns:
+        try:
+            df[column] = pd.to_numeric(df[column])
+            continue
+        except (ValueError, TypeError):
+            pass
+        
+        # The rule also matches e.g. "outside_range", which holds True/False;
+        # any other text is kept, as the C parser does
+        flags = df[column].map(CSV_BOOL_VALUES)
+        if flags.notna().sum() == df[column].notna().sum():
+            df[column] = flags.astype(bool) if flags.notna().all() else flags.astype(object)
+    
+    dtype = {column: column_type for column, column_type in (read_options.get('dtype') or {}).items() if column in df.columns}
+    return df.astype(dtype) if dtype else df
+
+def get_arrow_string_dtype():
+    """Arrow-backed string dtype with NaN for missing values, or None on older pandas"""
+    try:
+        return pd.StringDtype("pyarrow", na_value=float("nan"))
+    except TypeError:
+        try:
+            return pd.StringDtype("pyarrow_numpy")  # pandas 2.1 and 2.2
+        except (TypeError, ValueError):
             return None
+
+def use_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert plain text columns to Arrow-backed strings"""
+    string_dtype = get_arrow_string_dtype()
+    if string_dtype is None:
+        return df
+    
+    text_columns = [
+        column for column in df.columns
+        if pd.api.types.is_object_dtype(df[column].dtype) and pd.api.types.infer_dtype(df[column], skipna=True) == 'string'
+    ]
+    return df.astype({column: string_dtype for column in text_columns}) if text_columns else df
+
+def parse_csv(open_source, read_options: Optional[Dict] = None, kind: str = "") -> pd.DataFrame:
+    """Parse a CSV with the configured engine; open_source returns a fresh binary file object
+    
+    Files the Arrow engine cannot parse faithfully are re-read with the C
+    parser, and later files of the same kind skip the Arrow attempt.
+    """
+    read_options = read_options or {}
+    fallbacks = get_arrow_csv_fallbacks()
+    df = None
+    
+    if CSV_ENGINE == "pyarrow" and PYARROW_AVAILABLE and kind not in fallbacks:
+        try:
+            with open_source() as source:
+                df = read_arrow_csv(source, read_options)
+        except ValueError:
+            # Malformed rows the C parser may still accept
+            df = None
         
-        content = base64.b64decode(response.json()['content']).decode('utf-8')
-        return pd.read_csv(io.StringIO(content))
+        if df is None:
+            fallbacks.add(kind)
+    
+    if df is None:
+        with open_source() as source:
+            df = pd.read_csv(source, **read_options)
+    
+    return use_arrow_strings(df) if CSV_ARROW_STRINGS else df
+
+@contextmanager
+def open_blob_stream(sha: str):
+    """Open a git blob as a raw byte stream, fetched with the raw media type"""
+    url = get_git_url(f"blobs/{sha}")
+    response = github_request("GET", url, headers={"Accept": GITHUB_RAW_MEDIA_TYPE}, stream=True)
+    
+    with response:
+        if response.status_code != 200:
+            raise requests.HTTPError(f"blob {sha} returned {response.status_code}", response=response)
+        # The parser pulls the body off the socket in buffer-sized chunks
+        response.raw.decode_content = True
+        yield response.raw
+
+def stream_blob_csv(sha: str, read_options: Optional[Dict] = None, kind: str = CORRECTIONS_FILE) -> pd.DataFrame:
+    """Stream a git blob with the raw media type straight into the CSV parser"""
+    return parse_csv(lambda: open_blob_stream(sha), read_options, kind)
+
+def get_snapshot_path(sha: str) -> str:
+    """Path of the local snapshot for a dataset blob"""
+    return os.path.join(LOCAL_SNAPSHOT_DIR, f"{sha}.v{LOCAL_SNAPSHOT_FORMAT}.feather")
+
+def load_local_snapshot(sha: Optional[str]) -> Optional[pd.DataFrame]:
+    """Load the parsed frame saved for a blob sha, memory-mapping the snapshot file"""
+    if not PYARROW_AVAILABLE or not sha:
+        return None
+    
+    path = get_snapshot_path(sha)
+    try:
+        df = feather.read_table(path, memory_map=True).to_pandas()
+        # Loads count as use for eviction
+        os.utime(path)
+    except (OSError, ValueError):
+        # Missing, evicted meanwhile or truncated; the caller parses instead
+        return None
+    
+    return df
+
+def save_local_snapshot(sha: Optional[str], df: pd.DataFrame):
+    """Save a parsed frame under its blob sha so a restarted process can skip download and parse"""
+    if not PYARROW_AVAILABLE or not sha:
+        return
+    
+    path = get_snapshot_path(sha)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(LOCAL_SNAPSHOT_DIR, exist_ok=True)
+        # Uncompressed so loads can map the file instead of decoding it
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, TypeError):
+        # Read-only disk or a column Arrow cannot store; the snapshot is optional
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    
+    evict_local_snapshots(keep=path)
+
+def evict_local_snapshots(keep: str):
+    """Delete least recently used snapshots until they fit in LOCAL_SNAPSHOT_MAX_BYTES"""
+    snapshots = []
+    for entry in os.scandir(LOCAL_SNAPSHOT_DIR):
+        if not entry.name.endswith(".feather") or entry.path == keep:
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        snapshots.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = os.path.getsize(keep) + sum(size for _, size, _ in snapshots)
+    for _, size, path in sorted(snapshots):
+        if total <= LOCAL_SNAPSHOT_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+@st.cache_resource
+def get_contents_cache() -> Dict[str, Dict]:
+    """Process-wide cache of parsed contents API responses, keyed by URL"""
+    return {}
+
+def fetch_csv_contents(path: str) -> Tuple[Optional[pd.DataFrame], Optional[str], int]:
+    """Fetch a CSV through the contents API as (dataframe, blob sha, status code)
+    
+    Cached responses are revalidated with If-None-Match, so an unchanged file
+    costs a 304 (which does not count against the rate limit) and returns the
+    already-parsed frame. Dataset files are also kept as local snapshots, so
+    after a restart they are loaded from disk while their sha is unchanged.
+    Frames are shared between sessions; treat as read-only.
+    """
+    url = get_contents_url(path)
+    cache = get_contents_cache()
+    cached = cache.get(url)
+    read_options = get_csv_read_options(path)
+    
+    if not cached and path in DATASET_FILES:
+        # Fresh process: a dataset file still at the sha of the last listing
+        # is loaded from its local snapshot without downloading it
+        listing = cache.get(get_contents_url(""), {}).get('listing', {})
+        sha = listing.get(path)
+        df = load_local_snapshot(sha)
+        if df is not None:
+            cache[url] = {'etag': None, 'sha': sha, 'df': df}
+            return df, sha, 200
+    
+    headers = {"If-None-Match": cached['etag']} if cached and cached['etag'] else None
+    response = github_request("GET", url, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        return cached['df'], cached['sha'], 200
+    
+    if response.status_code != 200:
+        if response.status_code == 404:
+            cache.pop(url, None)
+        return None, None, response.status_code
+    
+    payload = response.json()
+    sha = payload.get('sha')
+    
+    # Same blob behind a new ETag: keep the parsed frame
+    if cached and sha and cached['sha'] == sha:
+        df = cached['df']
+    elif payload.get('encoding') == 'none' or 'content' not in payload:
+        # Files over 1 MB come back without inline content
+        df = stream_blob_csv(sha, read_options, path)
+    else:
+        content = base64.b64decode(payload['content'])
+        df = parse_csv(lambda: io.BytesIO(content), read_options, path)
+    
+    if path in DATASET_FILES and not (cached and cached['sha'] == sha):
+        save_local_snapshot(sha, df)
+    
+    etag = response.headers.get('ETag')
+    if etag:
+        cache[url] = {'etag': etag, 'sha': sha, 'df': df}
+    
+    return df, sha, 200
+
+def list_repo_root() -> Dict[str, str]:
+    """List the top level of the data repository as {name: sha}, revalidated with ETags"""
+    url = get_contents_url("")
+    cache = get_contents_cache()
+    cached = cache.get(url)
+    
+    headers = {"If-None-Match": cached['etag']} if cached else None
+    response = github_request("GET", url, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        return cached['listing']
+    if response.status_code != 200:
+        raise ValueError(f"Failed to list repository: {response.status_code}")
+    
+    listing = {entry['name']: entry['sha'] for entry in response.json()}
+    etag = response.headers.get('ETag')
+    if etag:
+        cache[url] = {'etag': etag, 'listing': listing}
+    
+    return listing
+
+def map_concurrently(func, items: Sequence) -> List:
+    """Run func over items in a thread pool that shares the script run context"""
+    if not items:
+        return []
+    
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(len(items), MAX_FETCH_WORKERS),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        return list(executor.map(func, items))
+
+def download_csv_from_github(filename: str) -> Tuple[Optional[pd.DataFrame], Optional[str], Optional[str]]:
+    """Fetch and parse CSV file from GitHub, returning (dataframe, blob sha, error message)"""
+    try:
+        df, sha, status_code = fetch_csv_contents(filename)
+        
+        if status_code != 200:
+            return None, None, f"Failed to load {filename}: {status_code}"
+        
+        return df, sha, None
         
     except requests.exceptions.Timeout:
-        st.error(f"⏱️ Timeout loading {filename}. Please check your connection.")
-        return None
+        return None, None, f"⏱️ Timeout loading {filename}. Please check your connection."
     except Exception as e:
-        st.error(f"Error loading {filename}: {str(e)}")
+        return None, None, f"Error loading {filename}: {str(e)}"
+
+def fetch_file_from_github(filename: str) -> Optional[pd.DataFrame]:
+    """Fetch and parse CSV file from GitHub"""
+    df, _, error = download_csv_from_github(filename)
+    if error:
+        st.error(error)
+    return df
+
+def fetch_files_from_github(filenames: Sequence[str]) -> Dict[str, Tuple[Optional[pd.DataFrame], Optional[str]]]:
+    """Fetch and parse several CSV files from GitHub concurrently, as {filename: (dataframe, blob sha)}"""
+    # Network calls run in worker threads; errors are reported from the
+    # script thread so they land in the page in file order
+    results = map_concurrently(download_csv_from_github, filenames)
+    
+    snapshot = {}
+    for filename, (df, sha, error) in zip(filenames, results):
+        if error:
+            st.error(error)
+        snapshot[filename] = (df, sha)
+    
+    return snapshot
+
+@st.cache_data(ttl=DATASET_VERSION_TTL, show_spinner=False)
+def get_dataset_version() -> str:
+    """Get the blob shas of the dataset files from the repository listing"""
+    listing = list_repo_root()
+    return ":".join(str(listing.get(filename)) for filename in DATASET_FILES)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_dataset(dataset_version: Optional[str]) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Dict], str]:
+    """Load constraints and logic data for one dataset version, kept until the files change
+    
+    Failed loads raise so they are not cached. Frames are shared between
+    sessions; treat as read-only.
+    """
+    snapshot = fetch_files_from_github(DATASET_FILES)
+    constraints_df, constraints_sha = snapshot["constraints.csv"]
+    logic_df, logic_sha = snapshot["logic.csv"]
+    
+    if constraints_df is None or logic_df is None:
+        raise ValueError("Could not load constraints and logic data")
+    
+    data_version = f"{constraints_sha}:{logic_sha}"
+    return constraints_df, logic_df, build_enumerator_index(constraints_df, logic_df), data_version
+
+def load_data_from_github() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Dict[str, Dict], Optional[str]]:
+    """Load constraints and logic data from GitHub with caching
+    
+    Also returns their enumerator index and a data version made of the blob
+    shas the frames were parsed from. Saving corrections does not touch this
+    cache; it is only reloaded when the dataset files change.
+    """
+    try:
+        dataset_version = get_dataset_version()
+    except:
+        # Listing unavailable; the load below reports its own errors
+        dataset_version = None
+    
+    try:
+        constraints_df, logic_df, enumerator_index, data_version = load_dataset(dataset_version)
+    except ValueError:
+        return None, None, build_enumerator_index(None, None), None
+    
+    st.success("✅ Data loaded from secure repository")
+    return constraints_df, logic_df, enumerator_index, data_version
+
+def check_token_validity() -> bool:
+    """Verify GitHub token is valid, skipping the call while a recent one succeeded"""
+    if time.monotonic() < get_token_status()['valid_until']:
+        return True
+    
+    try:
+        response = github_request("GET", f"{GITHUB_API_URL}/user")
+        
+        if response.status_code == 401:
+            st.error("🔐 Access token expired. Please contact administrator.")
+            return False
+        return True
+    except:
+        return False
+
+# ============================================================================
+# CORRECTIONS STORE
+# ============================================================================
+#
+# Corrections live in a compacted base file (corrections.csv) plus append-only
+# shards under corrections/<date>/, one small file per save batch. Saves only
+# create a new shard; readers merge the base and all shards; compaction folds
+# the shards back into the base file in a single commit.
+
+@st.cache_resource
+def get_blob_cache() -> Dict[str, pd.DataFrame]:
+    """Process-wide cache of parsed corrections blobs, keyed by blob sha"""
+    return {}
+
+def fetch_blob_frames(shas: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Fetch parsed blobs by sha; blobs are immutable so only new ones hit the network"""
+    cache = get_blob_cache()
+    missing = [sha for sha in dict.fromkeys(shas) if sha not in cache]
+    
+    for sha, df in zip(missing, map_concurrently(stream_blob_csv, missing)):
+        cache[sha] = df
+    
+    return {sha: cache[sha] for sha in shas}
+
+def list_correction_shards(tree_sha: str) -> List[Tuple[str, str]]:
+    """List (path, blob sha) of every shard under a corrections tree, oldest first"""
+    cache = get_contents_cache()
+    url = get_git_url(f"trees/{tree_sha}")
+    
+    # Trees are addressed by content, so a cached listing never goes stale
+    if url in cache:
+        return cache[url]['shards']
+    
+    response = github_request("GET", url, params={"recursive": 1})
+    if response.status_code != 200:
+        raise ValueError(f"Failed to list correction shards: {response.status_code}")
+    
+    shards = sorted(
+        (f"{CORRECTIONS_SHARD_DIR}/{entry['path']}", entry['sha'])
+        for entry in response.json().get('tree', [])
+        if entry['type'] == 'blob' and entry['path'].endswith('.csv')
+    )
+    cache[url] = {'shards': shards}
+    return shards
+
+def build_corrections_frame(base_sha: Optional[str], shards: List[Tuple[str, str]]) -> Optional[pd.DataFrame]:
+    """Merge the base corrections file and its shards into one frame"""
+    shas = ([base_sha] if base_sha else []) + [sha for _, sha in shards]
+    if not shas:
         return None
+    
+    frames = fetch_blob_frames(shas)
+    
+    # Drop blobs that are no longer part of the store (e.g. compacted shards)
+    cache = get_blob_cache()
+    for sha in [sha for sha in cache if sha not in frames]:
+        cache.pop(sha, None)
+    
+    return pd.concat([frames[sha] for sha in shas], ignore_index=True)
 
-@st.cache_data(ttl=CACHE_TTL)
-def load_data_from_github() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-    """Load constraints and logic data from GitHub with caching"""
-    constraints_df = fetch_file_from_github("constraints.csv")
-    logic_df = fetch_file_from_github("logic.csv")
+@st.cache_resource(ttl=CORRECTIONS_CACHE_TTL, show_spinner=False)
+def load_corrections_snapshot() -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+    """Load corrections as (version, dataframe), shared by every consumer for a short window
+    
+    Returns (None, None) when no corrections exist yet. Other failures raise so
+    they are not cached. Cleared explicitly after a successful save.
+    """
+    listing = list_repo_root()
+    base_sha = listing.get(CORRECTIONS_FILE)
+    tree_sha = listing.get(CORRECTIONS_SHARD_DIR)
+    
+    shards = list_correction_shards(tree_sha) if tree_sha else []
+    corrections_df = build_corrections_frame(base_sha, shards)
     
-    if constraints_df is not None and logic_df is not None:
-        st.success("✅ Data loaded from secure repository")
+    if corrections_df is None:
+        return None, None
     
-    return constraints_df, logic_df
+    return f"{base_sha}:{tree_sha}", corrections_df
 
 def load_existing_corrections() -> Optional[pd.DataFrame]:
     """Load existing corrections from GitHub"""
     try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/corrections.csv"
-        response = requests.get(corrections_url, headers=headers)
-        
-        if response.status_code == 200:
-            corrections_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            return pd.read_csv(io.StringIO(corrections_content))
-        else:
-            return None
+        return load_corrections_snapshot()[1]
     except:
         return None
 
-def save_corrections_to_github(corrections_df: pd.DataFrame) -> bool:
-    """Save or append corrections to GitHub"""
-    try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/corrections.csv"
-        
-        # Check if file exists and load existing data
-        response = requests.get(corrections_url, headers=headers)
-        sha = None
-        
-        if response.status_code == 200:
-            sha = response.json()['sha']
-            # Load existing corrections
-            existing_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            existing_df = pd.read_csv(io.StringIO(existing_content))
-            # Append new corrections
-            corrections_df = pd.concat([existing_df, corrections_df], ignore_index=True)
-        
+def get_shard_path(corrections_df: pd.DataFrame) -> str:
+    """Build a unique, date-partitioned path for a new corrections shard"""
+    now = datetime.now()
+    authors = corrections_df['corrected_by'].unique() if 'corrected_by' in corrections_df.columns else []
+    author = str(authors[0]) if len(authors) == 1 else 'batch'
+    author = re.sub(r'[^A-Za-z0-9_-]+', '_', author)
+    return f"{CORRECTIONS_SHARD_DIR}/{now.strftime('%Y-%m-%d')}/{now.strftime('%H%M%S')}_{author}_{uuid.uuid4().hex[:8]}.csv"
+
+def get_correction_keys(corrections_df: pd.DataFrame) -> pd.Series:
+    """Build the error key (error_type, unique_id, variable) of each saved correction"""
+    return (
+        format_key_part(corrections_df['error_type']) + '_' +
+        format_key_part(corrections_df['unique_id']) + '_' +
+        format_key_part(corrections_df['variable'])
+    )
+
+def drop_saved_corrections(corrections_df: pd.DataFrame) -> pd.DataFrame:
+    """Merge pending rows against the latest corrections, keeping only unsaved error keys"""
+    load_corrections_snapshot.clear()
+    _, latest_df = load_corrections_snapshot()
+    
+    if latest_df is None or len(latest_df) == 0 or not {'error_type', 'unique_id', 'variable'} <= set(latest_df.columns):
+        return corrections_df
+    
+    return corrections_df[~get_correction_keys(corrections_df).isin(get_correction_keys(latest_df))]
+
+def write_corrections_shard(corrections_df: pd.DataFrame) -> bool:
+    """Commit a batch of corrections to GitHub as a new append-only shard
+    
+    A concurrent commit to the branch makes the PUT fail with 409/422. On a
+    conflict the latest corrections are re-fetched, rows already saved under
+    the same error key are dropped, and the PUT is retried with backoff.
+    """
+    for attempt in range(CORRECTIONS_SAVE_ATTEMPTS):
         # Convert to CSV and encode
         csv_data = corrections_df.to_csv(index=False)
         encoded_data = base64.b64encode(csv_data.encode()).decode()
         
-        # Prepare payload
+        # Prepare payload; a new shard never needs the sha of an existing file
         payload = {
             "message": f"Add corrections - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             "content": encoded_data,
-            "branch": "main"
+            "branch": GITHUB_BRANCH
         }
         
-        if sha:
-            payload["sha"] = sha
+        response = github_request("PUT", get_contents_url(get_shard_path(corrections_df)), json=payload)
+        
+        if response.status_code in [200, 201]:
+            load_corrections_snapshot.clear()
+            return True
+        
+        if response.status_code not in GITHUB_CONFLICT_STATUS_CODES or attempt == CORRECTIONS_SAVE_ATTEMPTS - 1:
+            return False
+        
+        time.sleep(get_backoff_delay(attempt))
+        corrections_df = drop_saved_corrections(corrections_df)
+        if len(corrections_df) == 0:
+            return True
+    
+    return False
+
+def compact_corrections() -> int:
+    """Fold all shards into corrections.csv in one commit, returning the number of shards merged"""
+    for attempt in range(GITHUB_MAX_RETRIES + 1):
+        ref_url = get_git_url(f"refs/heads/{GITHUB_BRANCH}")
+        response = github_request("GET", ref_url)
+        if response.status_code != 200:
+            raise ValueError(f"Failed to read branch: {response.status_code}")
+        head_sha = response.json()['object']['sha']
+        
+        response = github_request("GET", get_git_url(f"commits/{head_sha}"))
+        if response.status_code != 200:
+            raise ValueError(f"Failed to read commit: {response.status_code}")
+        base_tree = response.json()['tree']['sha']
+        
+        response = github_request("GET", get_git_url(f"trees/{base_tree}"))
+        if response.status_code != 200:
+            raise ValueError(f"Failed to read tree: {response.status_code}")
+        root = {entry['path']: entry['sha'] for entry in response.json()['tree']}
+        
+        tree_sha = root.get(CORRECTIONS_SHARD_DIR)
+        shards = list_correction_shards(tree_sha) if tree_sha else []
+        if not shards:
+            return 0
+        
+        merged_df = build_corrections_frame(root.get(CORRECTIONS_FILE), shards)
+        
+        response = github_request("POST", get_git_url("blobs"), json={
+            "content": base64.b64encode(merged_df.to_csv(index=False).encode()).decode(),
+            "encoding": "base64"
+        })
+        if response.status_code != 201:
+            raise ValueError(f"Failed to upload compacted corrections: {response.status_code}")
+        
+        # Write the merged base file and delete every shard it absorbed
+        tree_entries = [{"path": CORRECTIONS_FILE, "mode": "100644", "type": "blob", "sha": response.json()['sha']}]
+        tree_entries += [{"path": path, "mode": "100644", "type": "blob", "sha": None} for path, _ in shards]
+        
+        response = github_request("POST", get_git_url("trees"), json={"base_tree": base_tree, "tree": tree_entries})
+        if response.status_code != 201:
+            raise ValueError(f"Failed to build compacted tree: {response.status_code}")
+        
+        response = github_request("POST", get_git_url("commits"), json={
+            "message": f"Compact {len(shards)} correction shards - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            "tree": response.json()['sha'],
+            "parents": [head_sha]
+        })
+        if response.status_code != 201:
+            raise ValueError(f"Failed to commit compacted corrections: {response.status_code}")
+        
+        # Fast-forward only: if a save landed meanwhile, start over from the new head
+        response = github_request("PATCH", ref_url, json={"sha": response.json()['sha'], "force": False})
+        if response.status_code == 200:
+            load_corrections_snapshot.clear()
+            return len(shards)
+        if response.status_code != 422 or attempt == GITHUB_MAX_RETRIES:
+            raise ValueError(f"Failed to update branch: {response.status_code}")
+        
+        time.sleep(get_backoff_delay(attempt))
+    
+    return 0
+
+def maybe_compact_corrections():
+    """Compact the corrections store once enough shards have piled up"""
+    try:
+        listing = list_repo_root()
+        tree_sha = listing.get(CORRECTIONS_SHARD_DIR)
+        if tree_sha and len(list_correction_shards(tree_sha)) >= CORRECTIONS_COMPACT_THRESHOLD:
+            compact_corrections()
+    except Exception:
+        # Best effort: shards stay readable until the next attempt
+        pass
+
+# ============================================================================
+# WRITE-BEHIND SAVE QUEUE
+# ============================================================================
+
+class CorrectionsWriteQueue:
+    """Process-wide write-behind queue that coalesces saves from all sessions
+    
+    Each submitted batch is appended to a local journal (fsync'd) and queued.
+    A background thread flushes everything queued as a single shard commit
+    every SAVE_FLUSH_INTERVAL seconds, or sooner once SAVE_FLUSH_MAX_ROWS rows
+    are waiting. Callers hold a Future that resolves once their rows are
+    committed. Batches left in the journal by a crash are replayed on startup,
+    backing off after each failed flush and dropped (with their rows logged)
+    after SAVE_REPLAY_ATTEMPTS failures.
+    """
+    
+    def __init__(self, journal_path: str):
+        self.journal_path = journal_path
+        self.condition = threading.Condition()
+        self.pending = []
+        
+        os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+        self._replay_journal()
+        threading.Thread(target=self._run, name="corrections-writer", daemon=True).start()
+    
+    def submit(self, corrections_df: pd.DataFrame) -> Future:
+        """Queue a batch of corrections; the Future resolves to True once committed"""
+        batch = {
+            'id': uuid.uuid4().hex,
+            # The journal copy is only read back after a crash; the frame itself is committed
+            'rows': json.loads(corrections_df.to_json(orient='records', date_format='iso', double_precision=15)),
+            'df': corrections_df,
+            'future': Future(),
+            'queued_at': time.monotonic()
+        }
+        
+        with self.condition:
+            with open(self.journal_path, 'a', encoding='utf-8') as journal:
+                journal.write(json.dumps({'id': batch['id'], 'rows': batch['rows']}) + '\n')
+                journal.flush()
+                os.fsync(journal.fileno())
+            self.pending.append(batch)
+            self.condition.notify()
+        
+        return batch['future']
+    
+    def _replay_journal(self):
+        """Queue batches journaled by a previous process that never got committed"""
+        if not os.path.exists(self.journal_path):
+            return
+        
+        with open(self.journal_path, encoding='utf-8') as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash mid-append
+                    continue
+                self.pending.append({'id': entry['id'], 'rows': entry['rows'], 'df': None, 'future': None,
+                                     'queued_at': time.monotonic(), 'attempts': 0})
+    
+    def _rewrite_journal(self):
+        """Rewrite the journal to hold only batches still waiting (caller holds the lock)"""
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as journal:
+            for batch in self.pending:
+                journal.write(json.dumps({'id': batch['id'], 'rows': batch['rows']}) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.journal_path)
+    
+    def _next_flush_delay(self) -> Optional[float]:
+        """Seconds until the queue should flush, 0 if due now, None if empty"""
+        if not self.pending:
+            return None
+        now = time.monotonic()
+        # Replayed batches backing off have a queued_at in the future
+        if sum(len(batch['rows']) for batch in self.pending if batch['queued_at'] <= now) >= SAVE_FLUSH_MAX_ROWS:
+            return 0
+        return max(0, min(batch['queued_at'] for batch in self.pending) + SAVE_FLUSH_INTERVAL - now)
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                delay = self._next_flush_delay()
+                while delay is None or delay > 0:
+                    self.condition.wait(timeout=delay)
+                    delay = self._next_flush_delay()
+                now = time.monotonic()
+                batches = [batch for batch in self.pending if batch['queued_at'] <= now]
+                self.pending = [batch for batch in self.pending if batch['queued_at'] > now]
             
-        response = requests.put(corrections_url, headers=headers, json=payload, timeout=10)
-        return response.status_code in [200, 201]
+            self._flush(batches)
+    
+    def _flush(self, batches: List[Dict]):
+        """Commit the given batches as one shard and settle their callers"""
+        # Callers that already gave up are dropped; the rest can no longer cancel
+        batches = [b for b in batches if b['future'] is None or b['future'].set_running_or_notify_cancel()]
         
-    except Exception as e:
-        st.error(f"Error saving to GitHub: {str(e)}")
-        return False
+        try:
+            frames = []
+            for batch in batches:
+                if batch['df'] is not None:
+                    frames.append(batch['df'])
+                elif batch['rows']:
+                    # Replayed rows may have been committed just before a crash
+                    frames.append(drop_saved_corrections(pd.DataFrame(batch['rows'])))
+            frames = [df for df in frames if len(df) > 0]
+            
+            saved, error = (write_corrections_shard(pd.concat(frames, ignore_index=True)) if frames else True), None
+        except Exception as e:
+            saved, error = False, e
+        
+        with self.condition:
+            if not saved:
+                # Replayed batches have no caller to report to; retry them later
+                for batch in batches:
+                    if batch['future'] is not None:
+                        continue
+                    batch['attempts'] += 1
+                    if batch['attempts'] >= SAVE_REPLAY_ATTEMPTS:
+                        logger.error("Dropping journaled corrections batch %s after %d failed attempts; rows: %s",
+                                     batch['id'], batch['attempts'], json.dumps(batch['rows']))
+                        continue
+                    batch['queued_at'] = time.monotonic() + GITHUB_BACKOFF_MAX * 2 ** batch['attempts']
+                    self.pending.append(batch)
+            
+            try:
+                self._rewrite_journal()
+            except OSError:
+                # Stale entries are harmless: replay drops rows already saved
+                pass
+        
+        for batch in batches:
+            if batch['future'] is None:
+                continue
+            if error is not None:
+                batch['future'].set_exception(error)
+            else:
+                batch['future'].set_result(saved)
+        
+        # Callers are settled first, so only this thread waits for compaction
+        if saved and frames:
+            maybe_compact_corrections()
 
-def check_token_validity() -> bool:
-    """Verify GitHub token is valid"""
+@st.cache_resource
+def get_corrections_queue() -> CorrectionsWriteQueue:
+    """Create the process-wide corrections write queue"""
+    return CorrectionsWriteQueue(os.path.join(LOCAL_CACHE_DIR, "corrections_journal.jsonl"))
+
+def save_corrections_to_github(corrections_df: pd.DataFrame) -> bool:
+    """Save corrections to GitHub through the write-behind queue, waiting until committed"""
     try:
-        headers = get_github_headers()
-        response = requests.get("https://api.github.com/user", headers=headers, timeout=5)
+        future = get_corrections_queue().submit(corrections_df)
         
-        if response.status_code == 401:
-            st.error("🔐 Access token expired. Please contact administrator.")
-            return False
-        return True
-    except:
+        try:
+            return future.result(timeout=SAVE_CONFIRM_TIMEOUT)
+        except FutureTimeoutError:
+            # Withdraw the batch if it has not been picked up; otherwise it is
+            # already being committed and the outcome is worth waiting for
+            if future.cancel():
+                return False
+            return future.result()
+        
+    except Exception as e:
+        st.error(f"Error saving to GitHub: {str(e)}")
         return False
 
 # ============================================================================
@@ -274,6 +1178,39 @@ def get_unique_id_column(df: pd.DataFrame) -> Optional[str]:
     
     return None
 
+def format_key_part(values: pd.Series) -> pd.Series:
+    """Format a column exactly as an f-string would, so built keys match error keys"""
+    # astype(str) is not enough: depending on the pandas version it keeps NaN as NaN
+    return values.astype(object).map(str)
+
+def coerce_to_float(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Convert values as float() would, returning the numbers and a mask of values it rejects"""
+    numbers = pd.to_numeric(values, errors='coerce').astype(float)
+    failed = pd.Series(False, index=values.index)
+    
+    # to_numeric turns blanks and a few spellings float() accepts into NaN, so only those are retried
+    unresolved = numbers.isna().to_numpy().nonzero()[0]
+    if len(unresolved) > 0:
+        parsed = []
+        rejected = []
+        for value in values.iloc[unresolved].tolist():
+            try:
+                parsed.append(float(value))
+                rejected.append(False)
+            except (TypeError, ValueError):
+                parsed.append(float('nan'))
+                rejected.append(True)
+        numbers.iloc[unresolved] = parsed
+        failed.iloc[unresolved] = rejected
+    
+    return numbers, failed
+
+def get_column_values(df: pd.DataFrame, column: str, default='N/A') -> List:
+    """Get a column as plain Python values, or the default for every row if it is missing"""
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].astype(object).tolist()
+
 def safe_get_unique_ids(df: pd.DataFrame) -> set:
     """Safely get unique IDs from dataframe"""
     if df is None or len(df) == 0:
@@ -289,6 +1226,38 @@ def safe_get_unique_ids(df: pd.DataFrame) -> set:
 # DATA PROCESSING FUNCTIONS
 # ============================================================================
 
+def group_positions_by(df: pd.DataFrame, column: str) -> Dict:
+    """Map each value of a column to its row positions, in a single pass"""
+    if df is None or len(df) == 0:
+        return {}
+    return df.groupby(column, sort=False, observed=True).indices
+
+def get_group_rows(df: pd.DataFrame, positions_by_key: Dict, key) -> pd.DataFrame:
+    """Select the rows of one group from a group_positions_by map"""
+    positions = positions_by_key.get(key)
+    return df.iloc[positions] if positions is not None else pd.DataFrame()
+
+def build_enumerator_index(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> Dict[str, Dict]:
+    """Map each enumerator to its row positions in the constraints and logic frames"""
+    enumerator_index = {}
+    
+    for name, df in (('constraints', constraints_df), ('logic', logic_df)):
+        enumerator_index[name] = group_positions_by(df, 'username')
+    
+    return enumerator_index
+
+def get_enumerator_rows(df: pd.DataFrame, partition: Dict, enumerator: str) -> pd.DataFrame:
+    """Select one enumerator's rows through a partition of the enumerator index"""
+    if df is None:
+        return pd.DataFrame()
+    
+    positions = partition.get(enumerator)
+    return df.iloc[positions] if positions is not None else df.iloc[0:0]
+
+def get_indexed_enumerators(enumerator_index: Dict[str, Dict]) -> set:
+    """Get every enumerator that has at least one error"""
+    return set(enumerator_index['constraints']) | set(enumerator_index['logic'])
+
 def extract_constraint_limits(constraint_text: str) -> Tuple[int, int]:
     """Extract min/max values from constraint text for display purposes only"""
     min_val, max_val = 0, 100000
@@ -312,37 +1281,41 @@ def extract_constraint_limits(constraint_text: str) -> Tuple[int, int]:
     
     return min_val, max_val
 
-def get_corrected_error_keys(enumerator: str) -> set:
-    """Get set of already corrected error keys for this enumerator"""
-    existing_corrections = load_existing_corrections()
+@st.cache_resource(max_entries=512, show_spinner=False)
+def build_corrected_error_keys(enumerator: str, corrections_version: str, _corrections_df: pd.DataFrame) -> frozenset:
+    """Build the corrected error keys of one enumerator for one corrections version"""
+    enumerator_corrections = _corrections_df[_corrections_df['corrected_by'] == enumerator]
+    
+    # Detect the ID column once for the whole frame
+    id_col = 'unique_id' if 'unique_id' in enumerator_corrections.columns else next(
+        (col for col in enumerator_corrections.columns if 'id' in col.lower() and col != 'error_type'),
+        None
+    )
+    if id_col is None or len(enumerator_corrections) == 0:
+        return frozenset()
     
-    if existing_corrections is None or len(existing_corrections) == 0:
-        return set()
+    # Rows with an empty ID never produced a key
+    ids = enumerator_corrections[id_col]
+    has_id = ids.astype(object).map(bool)
     
-    # Filter corrections for this enumerator
-    enumerator_corrections = existing_corrections[
-        existing_corrections['corrected_by'] == enumerator
-    ]
+    error_keys = (
+        format_key_part(enumerator_corrections['error_type'][has_id]) + '_' +
+        format_key_part(ids[has_id]) + '_' +
+        format_key_part(enumerator_corrections['variable'][has_id])
+    )
+    return frozenset(error_keys)
+
+def get_corrected_error_keys(enumerator: str) -> frozenset:
+    """Get set of already corrected error keys for this enumerator"""
+    try:
+        corrections_version, existing_corrections = load_corrections_snapshot()
+    except:
+        return frozenset()
     
-    # Create error keys
-    corrected_keys = set()
-    for _, row in enumerator_corrections.iterrows():
-        # Try to get unique_id, handle if column name is different
-        unique_id = None
-        if 'unique_id' in row:
-            unique_id = row['unique_id']
-        else:
-            # Try other possible column names
-            for col in row.index:
-                if 'id' in col.lower() and col != 'error_type':
-                    unique_id = row[col]
-                    break
-        
-        if unique_id:
-            error_key = f"{row['error_type']}_{unique_id}_{row['variable']}"
-            corrected_keys.add(error_key)
+    if existing_corrections is None or len(existing_corrections) == 0:
+        return frozenset()
     
-    return corrected_keys
+    return build_corrected_error_keys(enumerator, corrections_version, existing_corrections)
 
 def filter_uncorrected_errors(df: pd.DataFrame, error_type: str, enumerator: str) -> pd.DataFrame:
     """Remove already corrected errors from dataframe"""
@@ -360,64 +1333,178 @@ def filter_uncorrected_errors(df: pd.DataFrame, error_type: str, enumerator: str
     # Also check session state
     all_corrected = corrected_keys.union(st.session_state.corrected_errors)
     
-    return df[~df.apply(
-        lambda x: f"{error_type}_{x[id_col]}_{x['variable']}" in all_corrected,
-        axis=1
-    )]
+    # Anti-join on the (error_type, id, variable) key, built column-wise
+    error_keys = error_type + '_' + format_key_part(df[id_col]) + '_' + format_key_part(df['variable'])
+    return df[~error_keys.isin(all_corrected)]
 
-def get_enumerator_statistics(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> pd.DataFrame:
-    """Get detailed statistics for each enumerator"""
-    stats = []
+def get_queue_errors(enumerator_constraints: pd.DataFrame, enumerator_logic: pd.DataFrame, id_col: str) -> Dict[str, Tuple[str, str]]:
+    """Map the error key of every pending error in an enumerator's queue to (error type, variable)"""
+    queue = {}
     
-    # Get all unique enumerators
-    all_enumerators = set()
-    if constraints_df is not None and len(constraints_df) > 0:
-        all_enumerators.update(constraints_df['username'].unique())
-    if logic_df is not None and len(logic_df) > 0:
-        all_enumerators.update(logic_df['username'].unique())
+    for error_type, df in (('constraint', enumerator_constraints), ('logic', enumerator_logic)):
+        if df is None or len(df) == 0 or id_col not in df.columns:
+            continue
+        # Rows without an ID get no farmer group, hence no form, as in group_positions_by
+        df = df[df[id_col].notna()]
+        error_keys = error_type + '_' + format_key_part(df[id_col]) + '_' + format_key_part(df['variable'])
+        for error_key, variable in zip(error_keys.tolist(), df['variable'].tolist()):
+            queue[error_key] = (error_type, variable)
+    
+    return queue
+
+def get_enumerator_error_counts(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> pd.DataFrame:
+    """Count each enumerator's errors by type and saved corrections, sorted by username"""
+    error_rows = []
     
-    # Get all corrections
+    for category, df in (('Constraint', constraints_df), ('Logic', logic_df)):
+        if df is not None and len(df) > 0:
+            error_rows.append(df[['username']].assign(error_category=category))
+    
+    if not error_rows:
+        return pd.DataFrame(columns=['Username', 'Constraint Errors', 'Logic Errors', 'Total Errors', 'Solved'])
+    
+    counts = (pd.concat(error_rows, ignore_index=True)
+              .groupby(['username', 'error_category'], observed=True).size()
+              .unstack(fill_value=0)
+              .reindex(columns=['Constraint', 'Logic'], fill_value=0))
+    
+    # Get all corrections once and count them per enumerator
     existing_corrections = load_existing_corrections()
+    if existing_corrections is not None:
+        solved = existing_corrections['corrected_by'].value_counts().reindex(counts.index, fill_value=0)
+    else:
+        solved = pd.Series(0, index=counts.index)
+    
+    return pd.DataFrame({
+        'Username': counts.index.tolist(),
+        'Constraint Errors': counts['Constraint'].to_numpy(),
+        'Logic Errors': counts['Logic'].to_numpy(),
+        'Total Errors': (counts['Constraint'] + counts['Logic']).to_numpy(),
+        'Solved': solved.to_numpy()
+    })
+
+def get_enumerator_statistics(constraints_df: pd.DataFrame, logic_df: pd.DataFrame,
+                              enumerator_counts: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Get detailed statistics for each enumerator"""
+    if enumerator_counts is None:
+        enumerator_counts = get_enumerator_error_counts(constraints_df, logic_df)
+    
+    stats_df = enumerator_counts[['Username', 'Total Errors', 'Solved']].copy()
+    
+    # Calculate remaining
+    stats_df['Remaining'] = stats_df['Total Errors'] - stats_df['Solved']
+    
+    # Calculate percentage
+    percentage = stats_df['Solved'] / stats_df['Total Errors'] * 100
+    stats_df['Progress (%)'] = [round(p, 1) for p in percentage.tolist()]
+    
+    # Sort by remaining errors (descending)
+    stats_df = stats_df.sort_values('Remaining', ascending=False)
     
-    for enumerator in sorted(all_enumerators):
-        # Count total errors
-        constraint_errors = 0
-        logic_errors = 0
+    return stats_df
+
+def detect_strange_values(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> List[Dict]:
+    """Flag extreme, negative, non-numeric and highly discrepant values, in row order"""
+    strange_values = []
+    
+    # Analyze constraint errors for extreme values
+    if constraints_df is not None and len(constraints_df) > 0:
+        values, non_numeric = coerce_to_float(constraints_df['value'])
         
-        if constraints_df is not None and len(constraints_df) > 0:
-            constraint_errors = len(constraints_df[constraints_df['username'] == enumerator])
+        # Check for suspiciously large values
+        extremely_large = values > 100000
         
-        if logic_df is not None and len(logic_df) > 0:
-            logic_errors = len(logic_df[logic_df['username'] == enumerator])
+        # Check for negative values where they shouldn't be; a variable name that is not
+        # text cannot be checked for 'temp', and the row is reported as non-numeric instead
+        negative = values < 0
+        negative_value = negative.copy()
+        positions = negative.to_numpy().nonzero()[0]
+        names = constraints_df['variable'].iloc[positions].astype(object)
+        named = names.map(lambda v: isinstance(v, str)).astype(bool)
+        is_temperature = names.where(named, '').str.lower().str.contains('temp', regex=False)
+        negative_value.iloc[positions] = (named & ~is_temperature).to_numpy()
+        non_numeric.iloc[positions] = (~named).to_numpy()
         
-        total_errors = constraint_errors + logic_errors
+        flagged = (extremely_large | negative_value | non_numeric).to_numpy().nonzero()[0]
+        rows = constraints_df.iloc[flagged]
         
-        # Count solved errors
-        solved = 0
-        if existing_corrections is not None:
-            solved = len(existing_corrections[existing_corrections['corrected_by'] == enumerator])
+        for large, negative_flag, value, raw_value, variable, username, farmer, constraint in zip(
+                extremely_large.iloc[flagged].tolist(),
+                negative_value.iloc[flagged].tolist(),
+                values.iloc[flagged].tolist(),
+                rows['value'].astype(object).tolist(),
+                rows['variable'].astype(object).tolist(),
+                get_column_values(rows, 'username'),
+                get_column_values(rows, 'farmer_name'),
+                get_column_values(rows, 'constraint')):
+            if large:
+                error_type = 'Constraint - Extremely Large'
+            elif negative_flag:
+                error_type = 'Constraint - Negative Value'
+            else:
+                error_type = 'Constraint - Non-Numeric'
+                value = raw_value
+            
+            strange_values.append({
+                'Type': error_type,
+                'Variable': variable,
+                'Value': value,
+                'Username': username,
+                'Farmer': farmer,
+                'Constraint': constraint
+            })
+    
+    # Analyze logic errors for large discrepancies
+    if logic_df is not None and len(logic_df) > 0 and 'Troster Value' in logic_df.columns:
+        farmer_values, farmer_failed = coerce_to_float(logic_df['value'])
+        troster_values, troster_failed = coerce_to_float(logic_df['Troster Value'])
+        numeric = ~(farmer_failed | troster_failed)
+        difference = (farmer_values - troster_values).abs()
+        percent_diff = ((farmer_values - troster_values) / troster_values * 100).abs()
         
-        # Calculate remaining
-        remaining = total_errors - solved
+        # Large absolute discrepancy
+        large_discrepancy = numeric & (difference > 1000)
         
-        # Calculate percentage
-        percentage = (solved / total_errors * 100) if total_errors > 0 else 0
+        # Large percentage discrepancy (if both values are non-zero), more than 200%
+        large_percent = numeric & (farmer_values > 0) & (troster_values > 0) & (percent_diff > 200)
         
-        stats.append({
-            'Username': enumerator,
-            'Total Errors': total_errors,
-            'Solved': solved,
-            'Remaining': remaining,
-            'Progress (%)': round(percentage, 1)
-        })
-    
-    stats_df = pd.DataFrame(stats)
-    # Sort by remaining errors (descending)
-    stats_df = stats_df.sort_values('Remaining', ascending=False)
+        flagged = (large_discrepancy | large_percent).to_numpy().nonzero()[0]
+        rows = logic_df.iloc[flagged]
+        
+        for large, percent, farmer_val, troster_val, diff, pct, variable, username, farmer in zip(
+                large_discrepancy.iloc[flagged].tolist(),
+                large_percent.iloc[flagged].tolist(),
+                farmer_values.iloc[flagged].tolist(),
+                troster_values.iloc[flagged].tolist(),
+                difference.iloc[flagged].tolist(),
+                percent_diff.iloc[flagged].tolist(),
+                rows['variable'].astype(object).tolist(),
+                get_column_values(rows, 'username'),
+                get_column_values(rows, 'farmer_name')):
+            if large:
+                strange_values.append({
+                    'Type': 'Logic - Large Discrepancy',
+                    'Variable': variable,
+                    'Value': f"Farmer: {farmer_val}, System: {troster_val}, Diff: {diff}",
+                    'Username': username,
+                    'Farmer': farmer,
+                    'Constraint': f"Difference: {diff}"
+                })
+            
+            if percent:
+                strange_values.append({
+                    'Type': 'Logic - Large % Difference',
+                    'Variable': variable,
+                    'Value': f"Farmer: {farmer_val}, System: {troster_val}, {pct:.1f}% diff",
+                    'Username': username,
+                    'Farmer': farmer,
+                    'Constraint': f"{pct:.1f}% difference"
+                })
     
-    return stats_df
+    return strange_values
 
-def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.DataFrame) -> Dict:
+def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.DataFrame,
+                                     enumerator_counts: Optional[pd.DataFrame] = None) -> Dict:
     """Generate comprehensive error analysis summary"""
     analysis = {
         'error_type_overview': {},
@@ -447,11 +1534,9 @@ def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.
     combined_errors = pd.concat(all_errors, ignore_index=True)
     
     # Get all unique enumerators
-    all_enumerators = set()
-    if constraints_df is not None and len(constraints_df) > 0:
-        all_enumerators.update(constraints_df['username'].unique())
-    if logic_df is not None and len(logic_df) > 0:
-        all_enumerators.update(logic_df['username'].unique())
+    if enumerator_counts is None:
+        enumerator_counts = get_enumerator_error_counts(constraints_df, logic_df)
+    all_enumerators = set(enumerator_counts['Username'])
     
     # 1. Error Type Overview
     id_col = get_unique_id_column(combined_errors)
@@ -465,41 +1550,23 @@ def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.
     }
     
     # 2. Error Rate by Enumerator
-    enumerator_analysis = []
-    for enumerator in sorted(all_enumerators):
-        enum_errors = combined_errors[combined_errors['username'] == enumerator]
-        constraint_count = len(enum_errors[enum_errors['error_category'] == 'Constraint'])
-        logic_count = len(enum_errors[enum_errors['error_category'] == 'Logic'])
-        total_count = len(enum_errors)
-        
-        if total_count > 0:
-            # Get corrections
-            existing_corrections = load_existing_corrections()
-            solved = 0
-            if existing_corrections is not None:
-                solved = len(existing_corrections[existing_corrections['corrected_by'] == enumerator])
-            
-            error_rate = (total_count / analysis['error_type_overview']['Total Errors'] * 100) if analysis['error_type_overview']['Total Errors'] > 0 else 0
-            
-            enumerator_analysis.append({
-                'Username': enumerator,
-                'Constraint Errors': constraint_count,
-                'Logic Errors': logic_count,
-                'Total Errors': total_count,
-                'Solved': solved,
-                'Remaining': total_count - solved,
-                'Error Rate (%)': round(error_rate, 2),
-                'Completion Rate (%)': round((solved / total_count * 100), 2) if total_count > 0 else 0
-            })
+    enumerator_analysis = enumerator_counts.copy()
+    enumerator_analysis['Remaining'] = enumerator_analysis['Total Errors'] - enumerator_analysis['Solved']
+    
+    # Rounded like round() per row rather than numpy's rounding
+    error_rate = enumerator_analysis['Total Errors'] / analysis['error_type_overview']['Total Errors'] * 100
+    completion_rate = enumerator_analysis['Solved'] / enumerator_analysis['Total Errors'] * 100
+    enumerator_analysis['Error Rate (%)'] = [round(r, 2) for r in error_rate.tolist()]
+    enumerator_analysis['Completion Rate (%)'] = [round(r, 2) for r in completion_rate.tolist()]
     
-    analysis['error_rate_by_enumerator'] = pd.DataFrame(enumerator_analysis).sort_values('Total Errors', ascending=False)
+    analysis['error_rate_by_enumerator'] = enumerator_analysis.sort_values('Total Errors', ascending=False)
     
     # 3. Enumerators Without Errors
     enumerators_with_errors = set(combined_errors['username'].unique())
     analysis['enumerators_without_errors'] = [e for e in all_enumerators if e not in enumerators_with_errors]
     
     # 4. Most Common Variable Errors
-    variable_counts = combined_errors.groupby(['variable', 'error_category']).size().reset_index(name='count')
+    variable_counts = combined_errors.groupby(['variable', 'error_category'], observed=True).size().reset_index(name='count')
     variable_counts = variable_counts.sort_values('count', ascending=False)
     
     analysis['most_common_variables'] = {
@@ -509,79 +1576,7 @@ def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.
     }
     
     # 5. Strange/Outlier Values Detection
-    strange_values = []
-    
-    # Analyze constraint errors for extreme values
-    if constraints_df is not None and len(constraints_df) > 0:
-        for _, row in constraints_df.iterrows():
-            try:
-                value = float(row['value'])
-                
-                # Check for suspiciously large values
-                if value > 100000:
-                    strange_values.append({
-                        'Type': 'Constraint - Extremely Large',
-                        'Variable': row['variable'],
-                        'Value': value,
-                        'Username': row.get('username', 'N/A'),
-                        'Farmer': row.get('farmer_name', 'N/A'),
-                        'Constraint': row.get('constraint', 'N/A')
-                    })
-                
-                # Check for negative values where they shouldn't be
-                if value < 0 and 'temp' not in row['variable'].lower():
-                    strange_values.append({
-                        'Type': 'Constraint - Negative Value',
-                        'Variable': row['variable'],
-                        'Value': value,
-                        'Username': row.get('username', 'N/A'),
-                        'Farmer': row.get('farmer_name', 'N/A'),
-                        'Constraint': row.get('constraint', 'N/A')
-                    })
-            except:
-                # Non-numeric value
-                strange_values.append({
-                    'Type': 'Constraint - Non-Numeric',
-                    'Variable': row['variable'],
-                    'Value': row['value'],
-                    'Username': row.get('username', 'N/A'),
-                    'Farmer': row.get('farmer_name', 'N/A'),
-                    'Constraint': row.get('constraint', 'N/A')
-                })
-    
-    # Analyze logic errors for large discrepancies
-    if logic_df is not None and len(logic_df) > 0:
-        for _, row in logic_df.iterrows():
-            try:
-                farmer_val = float(row['value'])
-                troster_val = float(row['Troster Value'])
-                difference = abs(farmer_val - troster_val)
-                
-                # Large absolute discrepancy
-                if difference > 1000:
-                    strange_values.append({
-                        'Type': 'Logic - Large Discrepancy',
-                        'Variable': row['variable'],
-                        'Value': f"Farmer: {farmer_val}, System: {troster_val}, Diff: {difference}",
-                        'Username': row.get('username', 'N/A'),
-                        'Farmer': row.get('farmer_name', 'N/A'),
-                        'Constraint': f"Difference: {difference}"
-                    })
-                
-                # Large percentage discrepancy (if both values are non-zero)
-                if farmer_val > 0 and troster_val > 0:
-                    percent_diff = abs((farmer_val - troster_val) / troster_val * 100)
-                    if percent_diff > 200:  # More than 200% difference
-                        strange_values.append({
-                            'Type': 'Logic - Large % Difference',
-                            'Variable': row['variable'],
-                            'Value': f"Farmer: {farmer_val}, System: {troster_val}, {percent_diff:.1f}% diff",
-                            'Username': row.get('username', 'N/A'),
-                            'Farmer': row.get('farmer_name', 'N/A'),
-                            'Constraint': f"{percent_diff:.1f}% difference"
-                        })
-            except:
-                pass
+    strange_values = detect_strange_values(constraints_df, logic_df)
     
     analysis['strange_values'] = pd.DataFrame(strange_values) if strange_values else pd.DataFrame()
     
@@ -598,86 +1593,89 @@ def get_comprehensive_error_analysis(constraints_df: pd.DataFrame, logic_df: pd.
     
     return analysis
 
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_admin_analysis(fingerprint: str, _constraints_df: pd.DataFrame,
+                       _logic_df: pd.DataFrame) -> Tuple[Dict, pd.DataFrame]:
+    """Compute the admin analysis and enumerator statistics once per data fingerprint
+    
+    The fingerprint is built from the blob shas of constraints, logic and the
+    corrections snapshot. Results are shared between sessions; treat as read-only.
+    """
+    enumerator_counts = get_enumerator_error_counts(_constraints_df, _logic_df)
+    analysis = get_comprehensive_error_analysis(_constraints_df, _logic_df, enumerator_counts)
+    stats_df = get_enumerator_statistics(_constraints_df, _logic_df, enumerator_counts)
+    return analysis, stats_df
+
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
 
-def validate_corrections() -> Tuple[bool, List[str], int, int]:
-    """Validate all corrections are complete with explanations"""
-    total_errors = len(st.session_state.all_corrections_data)
+def get_draft_issue(draft: CorrectionDraft) -> Optional[str]:
+    """Get why a draft cannot be saved yet, or None when it is complete"""
+    explanation = draft.explanation.strip()
+    
+    # Check if explanation exists
+    if not explanation:
+        return 'no_explanation'
+    
+    # For constraint errors outside range, require detailed explanation
+    if draft.error_type == 'constraint' and draft.outside_range and len(explanation) < 20:
+        return 'outside_range'
+    
+    # For logic errors that differ from both values, encourage detailed explanation
+    if draft.error_type == 'logic' and draft.differs_from_both and len(explanation) < 15:
+        return 'differs_from_both'
+    
+    return None
+
+def validate_corrections(queue: Dict[str, Tuple[str, str]]) -> Tuple[bool, List[str], int, int]:
+    """Validate all corrections in the queue are complete with explanations
+    
+    Errors on farmer pages that were never opened have no draft yet and count
+    as missing an explanation.
+    """
+    total_errors = len(queue)
     completed = 0
     missing = []
     
-    for error_key, correction_data in st.session_state.all_corrections_data.items():
-        explanation = correction_data.get('explanation', '').strip()
-        
-        # Check if explanation exists
-        if not explanation:
-            var_name = correction_data['error_data']['variable']
-            error_type = "Constraint" if correction_data['error_type'] == 'constraint' else "Logic"
-            missing.append(f"{error_type}: {var_name} - No explanation provided")
-            continue
-        
-        # For constraint errors outside range, require detailed explanation
-        if correction_data['error_type'] == 'constraint':
-            if correction_data.get('outside_range', False):
-                if len(explanation) < 20:
-                    var_name = correction_data['error_data']['variable']
-                    missing.append(f"Constraint: {var_name} - Out-of-range value needs detailed explanation (min 20 chars)")
-                    continue
-        
-        # For logic errors that differ from both values, encourage detailed explanation
-        if correction_data['error_type'] == 'logic':
-            if correction_data.get('differs_from_both', False):
-                if len(explanation) < 15:
-                    var_name = correction_data['error_data']['variable']
-                    missing.append(f"Logic: {var_name} - Value differs from both records, needs better explanation")
-                    continue
+    for error_key, (error_type, var_name) in queue.items():
+        if error_key in st.session_state.all_corrections_data:
+            issue = st.session_state.correction_issues.get(error_key)
+        else:
+            issue = 'no_explanation'
         
-        completed += 1
+        if issue is None:
+            completed += 1
+        elif issue == 'no_explanation':
+            error_label = "Constraint" if error_type == 'constraint' else "Logic"
+            missing.append(f"{error_label}: {var_name} - No explanation provided")
+        elif issue == 'outside_range':
+            missing.append(f"Constraint: {var_name} - Out-of-range value needs detailed explanation (min 20 chars)")
+        else:
+            missing.append(f"Logic: {var_name} - Value differs from both records, needs better explanation")
     
     return completed == total_errors, missing, completed, total_errors
 
 def validate_farmer_corrections(farmer_id: str, id_col: str) -> Tuple[bool, List[str], int, int]:
     """Validate corrections for a specific farmer"""
-    farmer_corrections = {}
-    
-    for k, v in st.session_state.all_corrections_data.items():
-        farmer_id_val = v['error_data'].get(id_col)
-        if str(farmer_id_val) == str(farmer_id):
-            farmer_corrections[k] = v
+    farmer_corrections = get_farmer_corrections(farmer_id)
     
     total_errors = len(farmer_corrections)
-    completed = 0
+    completed = st.session_state.completed_by_farmer.get(str(farmer_id), 0)
     missing = []
     
-    for error_key, correction_data in farmer_corrections.items():
-        explanation = correction_data.get('explanation', '').strip()
-        
-        # Check if explanation exists
-        if not explanation:
-            var_name = correction_data['error_data']['variable']
-            error_type = "Constraint" if correction_data['error_type'] == 'constraint' else "Logic"
-            missing.append(f"{error_type}: {var_name}")
-            continue
-        
-        # For constraint errors outside range, require detailed explanation
-        if correction_data['error_type'] == 'constraint':
-            if correction_data.get('outside_range', False):
-                if len(explanation) < 20:
-                    var_name = correction_data['error_data']['variable']
-                    missing.append(f"Constraint: {var_name} - Needs detailed explanation")
-                    continue
-        
-        # For logic errors that differ from both values
-        if correction_data['error_type'] == 'logic':
-            if correction_data.get('differs_from_both', False):
-                if len(explanation) < 15:
-                    var_name = correction_data['error_data']['variable']
-                    missing.append(f"Logic: {var_name} - Needs better explanation")
-                    continue
-        
-        completed += 1
+    if completed < total_errors:
+        for error_key, correction_data in farmer_corrections.items():
+            issue = st.session_state.correction_issues.get(error_key)
+            var_name = correction_data.variable
+            
+            if issue == 'no_explanation':
+                error_type = "Constraint" if correction_data.error_type == 'constraint' else "Logic"
+                missing.append(f"{error_type}: {var_name}")
+            elif issue == 'outside_range':
+                missing.append(f"Constraint: {var_name} - Needs detailed explanation")
+            elif issue == 'differs_from_both':
+                missing.append(f"Logic: {var_name} - Needs better explanation")
     
     return completed == total_errors, missing, completed, total_errors
 
@@ -729,6 +1727,18 @@ def render_farmer_header(farmer_name: str, phone_no: str, error_count: int, comp
         </div>
     """, unsafe_allow_html=True)
 
+def seed_draft_widget(error_key: str, widget_key: str, field: str, default):
+    """Seed a widget from its saved draft, or the default, when it was not rendered on the last run
+    
+    The widget is then created without a value argument, so its identity does
+    not change between the first run and later ones.
+    """
+    if widget_key in st.session_state:
+        return
+    
+    draft = st.session_state.all_corrections_data.get(error_key)
+    st.session_state[widget_key] = default if draft is None else getattr(draft, field)
+
 def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
     """Render constraint error correction form"""
     st.markdown(f"### 🔒 {error['variable']}")
@@ -750,11 +1760,13 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
         st.caption(f"**Rule:** {error['constraint']}")
         st.caption(f"💡 Expected range: {min_val} - {max_val}")
     
+    seed_draft_widget(error_key, f"value_{error_key}", 'correct_value', default_value)
+    seed_draft_widget(error_key, f"explain_{error_key}", 'explanation', "")
+    
     with col2:
         # NO RESTRICTIONS on corrected value - enumerator can input any value
         correct_value = st.number_input(
             "Corrected Value",
-            value=default_value,
             step=1,
             key=f"value_{error_key}",
             help="Enter the actual correct value (no restrictions)"
@@ -766,6 +1778,7 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
     
     explanation = st.text_area(
         "📝 Explanation (Required)",
+        value="",
         placeholder="Why is this correction needed? What did the farmer say? If outside expected range, provide detailed justification.",
         key=f"explain_{error_key}",
         height=120,
@@ -773,14 +1786,16 @@ def render_constraint_error(error: pd.Series, error_key: str, id_col: str):
     )
     
     # Store correction data
-    st.session_state.all_corrections_data[error_key] = {
-        'error_type': 'constraint',
-        'error_data': error,
-        'correct_value': correct_value,
-        'explanation': explanation,
-        'outside_range': correct_value < min_val or correct_value > max_val,
-        'id_column': id_col
-    }
+    store_correction_draft(error_key, CorrectionDraft(
+        error_type='constraint',
+        farmer_id=error.get(id_col),
+        variable=error['variable'],
+        correct_value=correct_value,
+        explanation=explanation,
+        outside_range=correct_value < min_val or correct_value > max_val,
+        differs_from_both=False,
+        **get_draft_fields(error, 'constraint')
+    ))
     
     # Visual validation feedback
     if explanation and explanation.strip():
@@ -818,10 +1833,12 @@ def render_logic_error(discrepancy: pd.Series, error_key: str, id_col: str):
     with col3:
         st.metric("Difference", difference, delta=difference)
     
+    seed_draft_widget(error_key, f"value_{error_key}", 'correct_value', farmer_value)
+    seed_draft_widget(error_key, f"explain_{error_key}", 'explanation', "")
+    
     # Correction input - NO RESTRICTIONS
     correct_value = st.number_input(
         "Corrected Value",
-        value=farmer_value,
         step=1,
         key=f"value_{error_key}",
         help="Enter the actual correct value after verification (no restrictions)"
@@ -833,20 +1850,23 @@ def render_logic_error(discrepancy: pd.Series, error_key: str, id_col: str):
     
     explanation = st.text_area(
         "📝 Explanation (Required)",
+        value="",
         placeholder="Why is there a difference? What did you verify with the farmer? Explain the correct value.",
         key=f"explain_{error_key}",
         height=120
     )
     
     # Store correction data
-    st.session_state.all_corrections_data[error_key] = {
-        'error_type': 'logic',
-        'error_data': discrepancy,
-        'correct_value': correct_value,
-        'explanation': explanation,
-        'differs_from_both': correct_value != farmer_value and correct_value != troster_value,
-        'id_column': id_col
-    }
+    store_correction_draft(error_key, CorrectionDraft(
+        error_type='logic',
+        farmer_id=discrepancy.get(id_col),
+        variable=discrepancy['variable'],
+        correct_value=correct_value,
+        explanation=explanation,
+        outside_range=False,
+        differs_from_both=correct_value != farmer_value and correct_value != troster_value,
+        **get_draft_fields(discrepancy, 'Troster Value')
+    ))
     
     # Visual validation feedback
     if explanation and explanation.strip():
@@ -858,13 +1878,34 @@ def render_logic_error(discrepancy: pd.Series, error_key: str, id_col: str):
 # SAVE FUNCTIONS
 # ============================================================================
 
+def build_correction_record(draft: CorrectionDraft, selected_enumerator: str) -> Dict:
+    """Build the saved correction record for a draft"""
+    return {
+        'error_type': draft.error_type,
+        'username': draft.username,
+        'supervisor': draft.supervisor,
+        'woreda': draft.woreda,
+        'kebele': draft.kebele,
+        'farmer_name': draft.farmer_name,
+        'phone_no': draft.phone_no,
+        'subdate': draft.subdate,
+        'unique_id': draft.farmer_id,
+        'variable': draft.variable,
+        'original_value': draft.original_value,
+        'correct_value': draft.correct_value,
+        'explanation': draft.explanation,
+        'corrected_by': selected_enumerator,
+        'correction_date': datetime.now().strftime("%d-%b-%y"),
+        'correction_timestamp': datetime.now().isoformat(),
+        'outside_range': draft.outside_range,
+        'differs_from_both': draft.differs_from_both,
+        'reference_value': draft.reference_value
+    }
+
 def save_farmer_corrections(farmer_id: str, selected_enumerator: str, id_col: str) -> bool:
     """Save corrections for a specific farmer"""
     # Get corrections for this farmer
-    farmer_corrections = {}
-    for k, v in st.session_state.all_corrections_data.items():
-        if str(v['error_data'].get(id_col)) == str(farmer_id):
-            farmer_corrections[k] = v
+    farmer_corrections = get_farmer_corrections(farmer_id)
     
     if not farmer_corrections:
         return False
@@ -873,46 +1914,17 @@ def save_farmer_corrections(farmer_id: str, selected_enumerator: str, id_col: st
     corrections = []
     
     for error_key, correction_data in farmer_corrections.items():
-        error_data = correction_data['error_data']
-        
-        base_record = {
-            'error_type': correction_data['error_type'],
-            'username': error_data.get('username', ''),
-            'supervisor': error_data.get('supervisor', ''),
-            'woreda': error_data.get('woreda', ''),
-            'kebele': error_data.get('kebele', ''),
-            'farmer_name': error_data.get('farmer_name', ''),
-            'phone_no': error_data.get('phone_no', ''),
-            'subdate': error_data.get('subdate', ''),
-            'unique_id': error_data.get(id_col, ''),
-            'variable': error_data.get('variable', ''),
-            'original_value': error_data.get('value', ''),
-            'correct_value': correction_data['correct_value'],
-            'explanation': correction_data['explanation'],
-            'corrected_by': selected_enumerator,
-            'correction_date': datetime.now().strftime("%d-%b-%y"),
-            'correction_timestamp': datetime.now().isoformat(),
-            'outside_range': correction_data.get('outside_range', False),
-            'differs_from_both': correction_data.get('differs_from_both', False)
-        }
-        
-        if correction_data['error_type'] == 'constraint':
-            base_record['reference_value'] = error_data.get('constraint', '')
-        else:
-            base_record['reference_value'] = error_data.get('Troster Value', '')
-        
-        corrections.append(base_record)
+        corrections.append(build_correction_record(correction_data, selected_enumerator))
     
     if corrections:
         corrections_df = pd.DataFrame(corrections)
         
         if save_corrections_to_github(corrections_df):
             # Mark as corrected in session state
-            for error_key in farmer_corrections.keys():
+            for error_key in list(farmer_corrections.keys()):
                 st.session_state.corrected_errors.add(error_key)
                 # Remove from pending corrections
-                if error_key in st.session_state.all_corrections_data:
-                    del st.session_state.all_corrections_data[error_key]
+                remove_correction_draft(error_key)
             return True
     
     return False
@@ -921,7 +1933,7 @@ def save_farmer_corrections(farmer_id: str, selected_enumerator: str, id_col: st
 # ADMIN DASHBOARD
 # ============================================================================
 
-def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame, data_version: str):
     """Render admin dashboard with enhanced analytics"""
     st.title("📊 Admin Dashboard - HFC Data Correction")
     
@@ -936,7 +1948,12 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
     st.header("📈 High Frequency Check Summary")
     
     with st.spinner("Generating comprehensive analysis..."):
-        analysis = get_comprehensive_error_analysis(constraints_df, logic_df)
+        try:
+            corrections_version, _ = load_corrections_snapshot()
+        except:
+            # Analysis then sees no corrections, the same as when none exist
+            corrections_version = None
+        analysis, stats_df = get_admin_analysis(f"{data_version}|{corrections_version}", constraints_df, logic_df)
     
     # Overall Error Type Overview
     st.subheader("🎯 Error Type Overview")
@@ -1117,9 +2134,6 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
     
     # ========== PROGRESS TRACKING ==========
     
-    # Get statistics
-    stats_df = get_enumerator_statistics(constraints_df, logic_df)
-    
     # Overall metrics
     total_errors = stats_df['Total Errors'].sum()
     total_solved = stats_df['Solved'].sum()
@@ -1157,14 +2171,9 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
     st.subheader("📋 All Corrections")
     
     try:
-        headers = get_github_headers()
-        corrections_url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/corrections.csv"
-        response = requests.get(corrections_url, headers=headers)
+        _, all_corrections = load_corrections_snapshot()
         
-        if response.status_code == 200:
-            corrections_content = base64.b64decode(response.json()['content']).decode('utf-8')
-            all_corrections = pd.read_csv(io.StringIO(corrections_content))
-            
+        if all_corrections is not None:
             # Filters
             filter_col1, filter_col2, filter_col3 = st.columns(3)
             
@@ -1245,6 +2254,19 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
                     use_container_width=True
                 )
             
+            # Storage maintenance
+            st.markdown("---")
+            st.subheader("🗜️ Corrections Storage")
+            st.caption(f"Each save adds a small shard file; compaction merges them into {CORRECTIONS_FILE} in one commit.")
+            
+            if st.button("🗜️ Compact Correction Shards", use_container_width=True):
+                try:
+                    with st.spinner("Compacting corrections..."):
+                        merged_count = compact_corrections()
+                    st.success(f"✅ Merged {merged_count} shards into {CORRECTIONS_FILE}")
+                except Exception as e:
+                    st.error(f"Error compacting corrections: {str(e)}")
+            
         else:
             st.info("📭 No corrections submitted yet.")
             
@@ -1255,7 +2277,75 @@ def render_admin_dashboard(constraints_df: pd.DataFrame, logic_df: pd.DataFrame)
 # ENUMERATOR INTERFACE
 # ============================================================================
 
-def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataFrame):
+@fragment
+def render_farmer_corrections(farmer_id, farmer_constraint_errors: pd.DataFrame, farmer_logic_errors: pd.DataFrame,
+                              selected_enumerator: str, id_col: str):
+    """Render one farmer's correction forms; edits rerun only this block"""
+    total_farmer_errors = len(farmer_constraint_errors) + len(farmer_logic_errors)
+    
+    if total_farmer_errors == 0:
+        return
+    
+    # Get farmer info
+    farmer_name = ""
+    phone_no = ""
+    
+    if len(farmer_constraint_errors) > 0:
+        farmer_name = farmer_constraint_errors.iloc[0].get('farmer_name', 'Unknown')
+        phone_no = farmer_constraint_errors.iloc[0].get('phone_no', 'N/A')
+    elif len(farmer_logic_errors) > 0:
+        farmer_name = farmer_logic_errors.iloc[0].get('farmer_name', 'Unknown')
+        phone_no = farmer_logic_errors.iloc[0].get('phone_no', 'N/A')
+    
+    # Render farmer section
+    with st.expander(f"👨‍🌾 {farmer_name} 📞 {phone_no}", expanded=False):
+        # Header is filled in once the forms below have stored this run's drafts
+        header_placeholder = st.empty()
+        
+        st.markdown("---")
+        
+        # Process constraint errors
+        if len(farmer_constraint_errors) > 0:
+            st.markdown("#### 🔒 Constraint Errors")
+            for idx, error in farmer_constraint_errors.iterrows():
+                error_key = f"constraint_{error[id_col]}_{error['variable']}"
+                render_constraint_error(error, error_key, id_col)
+                st.markdown("---")
+        
+        # Process logic errors
+        if len(farmer_logic_errors) > 0:
+            st.markdown("#### 📊 Logic Discrepancies")
+            for idx, discrepancy in farmer_logic_errors.iterrows():
+                error_key = f"logic_{discrepancy[id_col]}_{discrepancy['variable']}"
+                render_logic_error(discrepancy, error_key, id_col)
+                st.markdown("---")
+        
+        # Check how many corrections are ready for this farmer
+        is_farmer_valid, farmer_missing, farmer_completed, farmer_total = validate_farmer_corrections(farmer_id, id_col)
+        
+        with header_placeholder.container():
+            render_farmer_header(farmer_name, phone_no, total_farmer_errors, farmer_completed)
+        
+        # Individual farmer save button
+        st.markdown("---")
+        
+        if is_farmer_valid:
+            if st.button(f"💾 Save Corrections for {farmer_name}", key=f"save_{farmer_id}", type="primary", use_container_width=True):
+                with st.spinner("Saving..."):
+                    if save_farmer_corrections(farmer_id, selected_enumerator, id_col):
+                        st.success(f"✅ Saved {farmer_completed} corrections for {farmer_name}!")
+                        st.balloons()
+                        # Full rerun so the farmer list and totals drop the saved errors
+                        st.rerun()
+                    else:
+                        st.error("Failed to save. Please try again.")
+        else:
+            st.warning(f"⚠️ Complete all corrections for this farmer to save ({farmer_completed}/{farmer_total} ready)")
+            with st.expander("Missing items"):
+                for item in farmer_missing:
+                    st.write(f"• {item}")
+
+def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataFrame, enumerator_index: Dict[str, Dict]):
     """Render main enumerator correction interface"""
     
     st.title("🌱 HFC Data Correction")
@@ -1266,13 +2356,7 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
     st.subheader("👤 Select Your Account")
     
     # Get all unique enumerators
-    all_enumerators = set()
-    if constraints_df is not None and len(constraints_df) > 0:
-        all_enumerators.update(constraints_df['username'].unique())
-    if logic_df is not None and len(logic_df) > 0:
-        all_enumerators.update(logic_df['username'].unique())
-    
-    all_enumerators = sorted(list(all_enumerators))
+    all_enumerators = sorted(get_indexed_enumerators(enumerator_index))
     
     if not all_enumerators:
         st.error("No enumerators found in the data")
@@ -1302,13 +2386,13 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
     
     # Filter data - now checks both session state and GitHub
     enumerator_constraints = filter_uncorrected_errors(
-        constraints_df[constraints_df['username'] == selected_enumerator] if constraints_df is not None else pd.DataFrame(),
+        get_enumerator_rows(constraints_df, enumerator_index['constraints'], selected_enumerator),
         'constraint',
         selected_enumerator
     )
     
     enumerator_logic = filter_uncorrected_errors(
-        logic_df[logic_df['username'] == selected_enumerator] if logic_df is not None else pd.DataFrame(),
+        get_enumerator_rows(logic_df, enumerator_index['logic'], selected_enumerator),
         'logic',
         selected_enumerator
     )
@@ -1359,86 +2443,55 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
     st.subheader("📞 Call Farmers & Correct Errors")
     st.caption("Complete corrections for each farmer and save individually, or save all at once")
     
-    for farmer_id in all_farmers_with_errors:
-        farmer_constraint_errors = enumerator_constraints[
-            enumerator_constraints[id_col] == farmer_id
-        ] if len(enumerator_constraints) > 0 else pd.DataFrame()
-        
-        farmer_logic_errors = enumerator_logic[
-            enumerator_logic[id_col] == farmer_id
-        ] if len(enumerator_logic) > 0 else pd.DataFrame()
-        
-        # Apply filter
-        if error_filter == "Constraints Only" and len(farmer_constraint_errors) == 0:
-            continue
-        if error_filter == "Logic Only" and len(farmer_logic_errors) == 0:
-            continue
-        
-        total_farmer_errors = len(farmer_constraint_errors) + len(farmer_logic_errors)
+    # Group rows by farmer once instead of filtering both frames per farmer
+    constraint_rows_by_farmer = group_positions_by(enumerator_constraints, id_col)
+    logic_rows_by_farmer = group_positions_by(enumerator_logic, id_col)
+    
+    # Apply filter
+    if error_filter == "Constraints Only":
+        filtered_farmers = [f for f in all_farmers_with_errors if f in constraint_rows_by_farmer]
+    elif error_filter == "Logic Only":
+        filtered_farmers = [f for f in all_farmers_with_errors if f in logic_rows_by_farmer]
+    else:
+        filtered_farmers = all_farmers_with_errors
+    
+    # Only one page of forms is rendered; drafts for other pages stay in session state
+    page_count = max(1, -(-len(filtered_farmers) // FARMERS_PER_PAGE))
+    page_context = (selected_enumerator, error_filter)
+    if st.session_state.farmer_page_context != page_context:
+        st.session_state.farmer_page_context = page_context
+        st.session_state.farmer_page = 0
+    st.session_state.farmer_page = min(st.session_state.farmer_page, page_count - 1)
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", key="farmer_page_prev", disabled=st.session_state.farmer_page == 0, use_container_width=True):
+                st.session_state.farmer_page -= 1
+                st.rerun()
+        with col2:
+            first = st.session_state.farmer_page * FARMERS_PER_PAGE
+            st.caption(f"Page {st.session_state.farmer_page + 1} of {page_count} · farmers {first + 1}-{min(first + FARMERS_PER_PAGE, len(filtered_farmers))} of {len(filtered_farmers)}")
+        with col3:
+            if st.button("Next ➡️", key="farmer_page_next", disabled=st.session_state.farmer_page >= page_count - 1, use_container_width=True):
+                st.session_state.farmer_page += 1
+                st.rerun()
+    
+    page_start = st.session_state.farmer_page * FARMERS_PER_PAGE
+    
+    for farmer_id in filtered_farmers[page_start:page_start + FARMERS_PER_PAGE]:
+        farmer_constraint_errors = get_group_rows(enumerator_constraints, constraint_rows_by_farmer, farmer_id)
+        farmer_logic_errors = get_group_rows(enumerator_logic, logic_rows_by_farmer, farmer_id)
         
-        if total_farmer_errors > 0:
-            # Get farmer info
-            farmer_name = ""
-            phone_no = ""
-            
-            if len(farmer_constraint_errors) > 0:
-                farmer_name = farmer_constraint_errors.iloc[0].get('farmer_name', 'Unknown')
-                phone_no = farmer_constraint_errors.iloc[0].get('phone_no', 'N/A')
-            elif len(farmer_logic_errors) > 0:
-                farmer_name = farmer_logic_errors.iloc[0].get('farmer_name', 'Unknown')
-                phone_no = farmer_logic_errors.iloc[0].get('phone_no', 'N/A')
-            
-            # Check how many corrections are ready for this farmer
-            is_farmer_valid, farmer_missing, farmer_completed, farmer_total = validate_farmer_corrections(farmer_id, id_col)
-            
-            # Render farmer section
-            with st.expander(f"👨‍🌾 {farmer_name} 📞 {phone_no}", expanded=False):
-                render_farmer_header(farmer_name, phone_no, total_farmer_errors, farmer_completed)
-                
-                st.markdown("---")
-                
-                # Process constraint errors
-                if len(farmer_constraint_errors) > 0:
-                    st.markdown("#### 🔒 Constraint Errors")
-                    for idx, error in farmer_constraint_errors.iterrows():
-                        error_key = f"constraint_{error[id_col]}_{error['variable']}"
-                        render_constraint_error(error, error_key, id_col)
-                        st.markdown("---")
-                
-                # Process logic errors
-                if len(farmer_logic_errors) > 0:
-                    st.markdown("#### 📊 Logic Discrepancies")
-                    for idx, discrepancy in farmer_logic_errors.iterrows():
-                        error_key = f"logic_{discrepancy[id_col]}_{discrepancy['variable']}"
-                        render_logic_error(discrepancy, error_key, id_col)
-                        st.markdown("---")
-                
-                # Individual farmer save button
-                st.markdown("---")
-                
-                if is_farmer_valid:
-                    if st.button(f"💾 Save Corrections for {farmer_name}", key=f"save_{farmer_id}", type="primary", use_container_width=True):
-                        with st.spinner("Saving..."):
-                            if save_farmer_corrections(farmer_id, selected_enumerator, id_col):
-                                st.success(f"✅ Saved {farmer_completed} corrections for {farmer_name}!")
-                                st.balloons()
-                                # Clear cache to reload data
-                                load_data_from_github.clear()
-                                st.rerun()
-                            else:
-                                st.error("Failed to save. Please try again.")
-                else:
-                    st.warning(f"⚠️ Complete all corrections for this farmer to save ({farmer_completed}/{farmer_total} ready)")
-                    with st.expander("Missing items"):
-                        for item in farmer_missing:
-                            st.write(f"• {item}")
+        render_farmer_corrections(farmer_id, farmer_constraint_errors, farmer_logic_errors, selected_enumerator, id_col)
     
     # Save all section
     st.markdown("---")
     st.header("💾 Save All Remaining Corrections")
     
     # Show overall progress
-    is_valid, missing_list, completed, total = validate_corrections()
+    queue = get_queue_errors(enumerator_constraints, enumerator_logic, id_col)
+    is_valid, missing_list, completed, total = validate_corrections(queue)
     render_progress_bar(completed, total)
     
     if not is_valid:
@@ -1460,51 +2513,12 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
         keys_to_remove = []
         
         for error_key, correction_data in st.session_state.all_corrections_data.items():
-            explanation = correction_data.get('explanation', '').strip()
-            
-            # Skip if no explanation
-            if not explanation:
-                continue
-            
-            # Skip if out of range without detailed explanation
-            if correction_data.get('outside_range', False) and len(explanation) < 20:
-                continue
-            
-            # Skip if differs from both without good explanation
-            if correction_data.get('differs_from_both', False) and len(explanation) < 15:
+            # Skip drafts outside this queue or whose explanation is missing or too short
+            if error_key not in queue or error_key in st.session_state.correction_issues:
                 continue
             
             # This correction is valid, include it
-            error_data = correction_data['error_data']
-            error_id_col = correction_data.get('id_column', id_col)
-            
-            base_record = {
-                'error_type': correction_data['error_type'],
-                'username': error_data.get('username', ''),
-                'supervisor': error_data.get('supervisor', ''),
-                'woreda': error_data.get('woreda', ''),
-                'kebele': error_data.get('kebele', ''),
-                'farmer_name': error_data.get('farmer_name', ''),
-                'phone_no': error_data.get('phone_no', ''),
-                'subdate': error_data.get('subdate', ''),
-                'unique_id': error_data.get(error_id_col, ''),
-                'variable': error_data.get('variable', ''),
-                'original_value': error_data.get('value', ''),
-                'correct_value': correction_data['correct_value'],
-                'explanation': correction_data['explanation'],
-                'corrected_by': selected_enumerator,
-                'correction_date': datetime.now().strftime("%d-%b-%y"),
-                'correction_timestamp': datetime.now().isoformat(),
-                'outside_range': correction_data.get('outside_range', False),
-                'differs_from_both': correction_data.get('differs_from_both', False)
-            }
-            
-            if correction_data['error_type'] == 'constraint':
-                base_record['reference_value'] = error_data.get('constraint', '')
-            else:
-                base_record['reference_value'] = error_data.get('Troster Value', '')
-            
-            corrections.append(base_record)
+            corrections.append(build_correction_record(correction_data, selected_enumerator))
             keys_to_remove.append(error_key)
         
         if corrections:
@@ -1520,11 +2534,8 @@ def render_enumerator_interface(constraints_df: pd.DataFrame, logic_df: pd.DataF
                     # Mark as corrected and remove from pending
                     for error_key in keys_to_remove:
                         st.session_state.corrected_errors.add(error_key)
-                        if error_key in st.session_state.all_corrections_data:
-                            del st.session_state.all_corrections_data[error_key]
+                        remove_correction_draft(error_key)
                     
-                    # Clear cache to reload data
-                    load_data_from_github.clear()
                     st.rerun()
                 else:
                     st.error("❌ Failed to save. Please try again or contact support.")
@@ -1563,9 +2574,13 @@ def main():
         if not check_token_validity():
             st.stop()
     
+    # Start the writer now so batches journaled before a restart are committed
+    # without waiting for the next save
+    get_corrections_queue()
+    
     # Load data
     with st.spinner("Loading data from secure repository..."):
-        constraints_df, logic_df = load_data_from_github()
+        constraints_df, logic_df, enumerator_index, data_version = load_data_from_github()
     
     if constraints_df is None or logic_df is None:
         st.error("❌ Could not load data from repository")
@@ -1580,10 +2595,10 @@ def main():
     
     # Route to appropriate interface
     if st.session_state.is_admin:
-        render_admin_dashboard(constraints_df, logic_df)
+        render_admin_dashboard(constraints_df, logic_df, data_version)
     else:
         render_admin_login()
-        render_enumerator_interface(constraints_df, logic_df)
+        render_enumerator_interface(constraints_df, logic_df, enumerator_index)
     
     # Footer
     st.markdown("---")